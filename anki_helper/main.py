@@ -4,31 +4,135 @@ Anki Audio & Content Generator CLI
 A command-line tool to generate German vocabulary using Gemini AI and add TTS audio to Anki cards using ElevenLabs.
 """
 
+import argparse
+
 import requests
+from requests.adapters import HTTPAdapter, Retry
 import base64
+import hashlib
+import threading
 import time
 import re
 import json
 import os
+import sys
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import islice
+from pathlib import Path
 from tqdm import tqdm
 from elevenlabs.client import ElevenLabs
 import google.generativeai as genai
 from dotenv import load_dotenv
 
+# orjson parses large notesInfo responses several times faster than the
+# stdlib; fall back silently when it is not installed
+try:
+    import orjson
+
+    def _json_dumps(obj):
+        return orjson.dumps(obj)
+
+    _json_loads = orjson.loads
+except ImportError:
+
+    def _json_dumps(obj):
+        return json.dumps(obj).encode("utf-8")
+
+    _json_loads = json.loads
+
+# Field-cleaning patterns, compiled once instead of per note
+_SOUND_RE = re.compile(r"\[sound:[^\]]+\]")
+_BRACKET_RE = re.compile(r"\[[^\]]+\](?![^[]*sound)")
+_BLANK_LINE_RE = re.compile(r"\n\s*\n")
+
+# Ask Gemini for JSON directly instead of stripping markdown fences off
+# free-form text; a malformed response would otherwise cost a full
+# regeneration round-trip
+_JSON_GENERATION_CONFIG = {"response_mime_type": "application/json"}
+
+# Grammar-card layouts, parsed once at import instead of re-built as
+# f-strings for every card; format_map takes the rule dict directly
+_GRAMMAR_FRONT_TMPL = "{rule}\n\n{example}"
+_GRAMMAR_BACK_TMPL = """<b>Rule:</b> {rule}
+
+<b>Explanation:</b> {explanation}
+
+<b>Pronunciation Tip:</b> {pronunciation_tip}
+
+<b>Example:</b> {example}
+<b>Pronunciation:</b> {example_pronunciation}
+
+<b>Memory Tip:</b> {memory_tip}"""
+
+
+class RateLimiter:
+    """Simple thread-safe rate limiter (max `rate_per_sec` calls per second)"""
+
+    def __init__(self, rate_per_sec):
+        # A non-positive rate means "no throttling"
+        self.interval = 1.0 / rate_per_sec if rate_per_sec > 0 else 0.0
+        self.lock = threading.Lock()
+        self.next_slot = time.monotonic()
+
+    def acquire(self):
+        """Block until the caller may make another request"""
+        with self.lock:
+            now = time.monotonic()
+            wait = self.next_slot - now
+            self.next_slot = max(self.next_slot, now) + self.interval
+        if wait > 0:
+            time.sleep(wait)
+
 
 class AnkiAudioGenerator:
+    ANKI_URL = "http://localhost:8765"
+
     def __init__(self):
         self.elevenlabs_client = None
         self.gemini_client = None
         self.config = {}
+        # One keep-alive session for every AnkiConnect call so we don't pay a
+        # TCP handshake per request
+        self.http = requests.Session()
+        # Payloads are serialized with _json_dumps, so set the content type once
+        self.http.headers["Content-Type"] = "application/json"
+        self.http.mount(
+            "http://",
+            HTTPAdapter(
+                pool_connections=4,
+                pool_maxsize=16,
+                max_retries=Retry(total=3, backoff_factor=0.2),
+            ),
+        )
+        # On-disk cache of synthesized audio so repeated text (and re-runs
+        # after partial failures) skip the ElevenLabs round-trip entirely
+        self.tts_cache_dir = Path(os.getenv("TTS_CACHE", "~/.ankitts-cache")).expanduser()
+        # Deck-analysis summaries, keyed by deck name, so repeated content
+        # generation in one run reuses the first analysis
+        self._deck_summary_cache = {}
+        # Deck and field lookups change rarely; memoize them for the run
+        self._decks_cache = None
+        self._fields_cache = {}
+        # Deck-exists + model-name bootstrap, memoized per deck so the second
+        # card-creation run in a session skips the AnkiConnect round-trips
+        self._deck_model_cache = {}
+        # Set by run() for non-interactive (--action/--yes) invocations
+        self.interactive = True
+        self.assume_yes = False
+        # Notes already given audio this session (bounded LRU): guards
+        # back-to-back process_deck runs against Anki's media store lagging
+        # behind the search index
+        self._done_notes = OrderedDict()
 
     def print_banner(self):
         """Print welcome banner"""
-        print("=" * 60)
-        print("        🎵 ANKI AUDIO & CONTENT GENERATOR 🎵")
-        print("  Generate German content with Gemini + TTS audio")
-        print("=" * 60)
-        print()
+        # One write per screen instead of a print (lock + flush) per line
+        sys.stdout.write(
+            "=" * 60 + "\n"
+            "        🎵 ANKI AUDIO & CONTENT GENERATOR 🎵\n"
+            "  Generate German content with Gemini + TTS audio\n" + "=" * 60 + "\n\n"
+        )
 
     def check_anki_running(self):
         """Check if Anki is running and AnkiConnect is available"""
@@ -36,17 +140,18 @@ class AnkiAudioGenerator:
         print("=" * 40)
 
         # Check if Anki is running
-        print("Please make sure Anki is running on your computer.")
-        input("Press Enter when Anki is open and ready... ")
+        if self.interactive:
+            print("Please make sure Anki is running on your computer.")
+            input("Press Enter when Anki is open and ready... ")
 
         # Test AnkiConnect connection
         try:
-            response = requests.post(
-                "http://localhost:8765",
-                json={"action": "version", "version": 6},
+            response = self.http.post(
+                self.ANKI_URL,
+                data=_json_dumps({"action": "version", "version": 6}),
                 timeout=5,
             )
-            result = response.json()
+            result = _json_loads(response.content)
 
             if result.get("error"):
                 print(f"❌ AnkiConnect error: {result['error']}")
@@ -70,107 +175,177 @@ class AnkiAudioGenerator:
             return False
 
     def get_anki_decks(self):
-        """Get list of available Anki decks"""
+        """Get list of available Anki decks (memoized for the run)"""
+        if self._decks_cache is not None:
+            return self._decks_cache
+
         try:
-            response = requests.post(
-                "http://localhost:8765", json={"action": "deckNames", "version": 6}
+            response = self.http.post(
+                self.ANKI_URL, data=_json_dumps({"action": "deckNames", "version": 6})
             )
-            result = response.json()
-            return result.get("result", [])
-        except:
+            result = _json_loads(response.content)
+            self._decks_cache = result.get("result", [])
+            return self._decks_cache
+        except (requests.RequestException, ValueError):
+            # Don't cache failures — a later call may succeed once Anki is up
             return []
 
     def get_deck_fields(self, deck_name):
-        """Get available fields for a deck"""
+        """Get available fields for a deck (memoized per deck for the run)"""
+        cached = self._fields_cache.get(deck_name)
+        if cached is not None:
+            return cached
+
         try:
             # Get a sample note from the deck
-            response = requests.post(
-                "http://localhost:8765",
-                json={
-                    "action": "findNotes",
-                    "version": 6,
-                    "params": {"query": f'deck:"{deck_name}"'},
-                },
+            response = self.http.post(
+                self.ANKI_URL,
+                data=_json_dumps(
+                    {
+                        "action": "findNotes",
+                        "version": 6,
+                        "params": {"query": f'deck:"{deck_name}"'},
+                    }
+                ),
             )
-            note_ids = response.json().get("result", [])
+            note_ids = _json_loads(response.content).get("result", [])
 
             if not note_ids:
                 return []
 
             # Get note info for the first note
-            response = requests.post(
-                "http://localhost:8765",
-                json={
-                    "action": "notesInfo",
-                    "version": 6,
-                    "params": {"notes": [note_ids[0]]},
-                },
+            response = self.http.post(
+                self.ANKI_URL,
+                data=_json_dumps(
+                    {
+                        "action": "notesInfo",
+                        "version": 6,
+                        "params": {"notes": [note_ids[0]]},
+                    }
+                ),
             )
-            notes = response.json().get("result", [])
+            notes = _json_loads(response.content).get("result", [])
 
             if notes:
-                return list(notes[0]["fields"].keys())
+                fields = list(notes[0]["fields"].keys())
+                self._fields_cache[deck_name] = fields
+                return fields
             return []
-        except:
+        except (requests.RequestException, ValueError, KeyError):
             return []
 
+    # Maps .env keys to config keys; drives load_env_config so a new
+    # setting is one table row instead of another hand-rolled if branch.
+    # The TTS_* entries are throttle knobs (concurrent syntheses / requests
+    # per second — match your provider tier) and ElevenLabs model/format
+    # overrides, e.g. eleven_flash_v2_5 or a lower-bitrate mp3 format.
+    CONFIG_KEYS = (
+        ("GEMINI_API_KEY", "gemini_api_key"),
+        ("ELEVENLABS_API_KEY", "api_key"),
+        ("ELEVENLABS_VOICE_ID", "voice_id"),
+        ("TARGET_LANGUAGE", "target_language"),
+        ("MOTHER_LANGUAGE", "mother_language"),
+        ("ANKI_DECK_NAME", "deck_name"),
+        ("TEXT_FIELD", "text_field"),
+        ("AUDIO_FIELD", "audio_field"),
+        ("TTS_CONCURRENCY", "tts_concurrency"),
+        ("TTS_RATE_PER_SEC", "tts_rate_per_sec"),
+        ("TTS_MODEL_ID", "tts_model_id"),
+        ("TTS_OUTPUT_FORMAT", "tts_output_format"),
+    )
+
+    # Config keys that must be present before any prompting can be skipped
+    REQUIRED_CONFIG = (
+        "deck_name",
+        "text_field",
+        "audio_field",
+        "gemini_api_key",
+        "api_key",
+        "voice_id",
+        "target_language",
+        "mother_language",
+    )
+
     def load_env_config(self):
         """Load configuration from .env file if it exists"""
         load_dotenv()
 
+        env_get = os.environ.get
         env_config = {}
-        if os.getenv("GEMINI_API_KEY"):
-            env_config["gemini_api_key"] = os.getenv("GEMINI_API_KEY")
-        if os.getenv("ELEVENLABS_API_KEY"):
-            env_config["api_key"] = os.getenv("ELEVENLABS_API_KEY")
-        if os.getenv("ELEVENLABS_VOICE_ID"):
-            env_config["voice_id"] = os.getenv("ELEVENLABS_VOICE_ID")
-        if os.getenv("TARGET_LANGUAGE"):
-            env_config["target_language"] = os.getenv("TARGET_LANGUAGE")
-        if os.getenv("MOTHER_LANGUAGE"):
-            env_config["mother_language"] = os.getenv("MOTHER_LANGUAGE")
-        if os.getenv("ANKI_DECK_NAME"):
-            env_config["deck_name"] = os.getenv("ANKI_DECK_NAME")
-        if os.getenv("TEXT_FIELD"):
-            env_config["text_field"] = os.getenv("TEXT_FIELD")
-        if os.getenv("AUDIO_FIELD"):
-            env_config["audio_field"] = os.getenv("AUDIO_FIELD")
+        for env_name, cfg_name in self.CONFIG_KEYS:
+            value = env_get(env_name)
+            if value:
+                env_config[cfg_name] = value
 
         return env_config
 
+    # Fallbacks written when a key was never configured; the optional TTS_*
+    # knobs have no entry here and are only persisted once set
+    _SAVE_DEFAULTS = {
+        "target_language": "de",
+        "mother_language": "en",
+        "deck_name": "german",
+        "text_field": "Front",
+        "audio_field": "Front",
+    }
+
     def save_config_to_env(self):
         """Save current configuration to .env file"""
         try:
-            env_content = f"""# AnkiTTS Configuration
-# Generated automatically - edit with care
-
-# Google Gemini API Key
-GEMINI_API_KEY={self.config.get('gemini_api_key', '')}
-
-# ElevenLabs API Key
-ELEVENLABS_API_KEY={self.config.get('api_key', '')}
-
-# ElevenLabs Voice ID
-ELEVENLABS_VOICE_ID={self.config.get('voice_id', '')}
-
-# Language Configuration
-TARGET_LANGUAGE={self.config.get('target_language', 'de')}
-MOTHER_LANGUAGE={self.config.get('mother_language', 'en')}
-
-# Anki Configuration
-ANKI_DECK_NAME={self.config.get('deck_name', 'german')}
-TEXT_FIELD={self.config.get('text_field', 'Front')}
-AUDIO_FIELD={self.config.get('audio_field', 'Front')}
-"""
+            lines = [
+                "# AnkiTTS Configuration",
+                "# Generated automatically - edit with care",
+                "",
+            ]
+            for env_name, cfg_name in self.CONFIG_KEYS:
+                value = self.config.get(cfg_name) or self._SAVE_DEFAULTS.get(
+                    cfg_name, ""
+                )
+                if not value and cfg_name.startswith("tts_"):
+                    continue
+                lines.append(f"{env_name}={value}")
+            env_content = "\n".join(lines) + "\n"
 
-            with open(".env", "w") as f:
+            # Write to a temp file and os.replace so an interrupted write
+            # cannot leave a truncated .env behind
+            with open(".env.tmp", "w") as f:
                 f.write(env_content)
+            os.replace(".env.tmp", ".env")
             print("✅ Configuration saved to .env file")
             return True
         except Exception as e:
             print(f"❌ Failed to save configuration: {e}")
             return False
 
+    def confirm(self, prompt):
+        """Ask a y/n question; auto-answers yes when running with --yes"""
+        if self.assume_yes:
+            return True
+        return input(prompt).strip().lower() == "y"
+
+    @staticmethod
+    def _pick_option(options, prompt, kind):
+        """Prompt until the user picks one of `options` by number or name
+
+        A single int() attempt replaces the isdigit()+int() double parse;
+        name lookups go through a precomputed set.
+        """
+        options_set = set(options)
+        while True:
+            choice = input(prompt).strip()
+
+            try:
+                idx = int(choice) - 1
+            except ValueError:
+                if choice in options_set:
+                    return choice
+                print(f"❌ {kind} not found. Please try again.")
+                continue
+
+            if 0 <= idx < len(options):
+                return options[idx]
+            print("❌ Invalid number. Please try again.")
+
     def collect_configuration(self):
         """Collect all configuration from user"""
         print("\n🛠️  Step 2: Configuration")
@@ -183,6 +358,20 @@ AUDIO_FIELD={self.config.get('audio_field', 'Front')}
             for key in env_config:
                 self.config[key] = env_config[key]
 
+        # Fast path: a complete .env means no prompting at all — print the
+        # summary and move straight on to validation
+        if all(self.config.get(key) for key in self.REQUIRED_CONFIG):
+            self.config["language_code"] = self.config["target_language"]
+            print("📁 Complete configuration found in .env — skipping prompts")
+            print(f"Deck: {self.config['deck_name']}")
+            print(
+                f"Fields: text='{self.config['text_field']}', audio='{self.config['audio_field']}'"
+            )
+            print(
+                f"Languages: target='{self.config['target_language']}', mother='{self.config['mother_language']}'"
+            )
+            return True
+
         # Get deck name
         if not self.config.get("deck_name"):
             decks = self.get_anki_decks()
@@ -192,27 +381,9 @@ AUDIO_FIELD={self.config.get('audio_field', 'Front')}
                     print(f"  {i}. {deck}")
                 print()
 
-                while True:
-                    deck_input = input(
-                        "Enter deck name (or number from list above): "
-                    ).strip()
-
-                    # Check if it's a number
-                    if deck_input.isdigit():
-                        idx = int(deck_input) - 1
-                        if 0 <= idx < len(decks):
-                            self.config["deck_name"] = decks[idx]
-                            break
-                        else:
-                            print("❌ Invalid number. Please try again.")
-                            continue
-
-                    # Check if it's a deck name
-                    if deck_input in decks:
-                        self.config["deck_name"] = deck_input
-                        break
-                    else:
-                        print("❌ Deck not found. Please try again.")
+                self.config["deck_name"] = self._pick_option(
+                    decks, "Enter deck name (or number from list above): ", "Deck"
+                )
             else:
                 self.config["deck_name"] = input("Enter Anki deck name: ").strip()
         else:
@@ -231,49 +402,21 @@ AUDIO_FIELD={self.config.get('audio_field', 'Front')}
 
                 # Get text field
                 if not self.config.get("text_field"):
-                    while True:
-                        text_field_input = input(
-                            "Enter field name containing text to read (or number): "
-                        ).strip()
-
-                        if text_field_input.isdigit():
-                            idx = int(text_field_input) - 1
-                            if 0 <= idx < len(fields):
-                                self.config["text_field"] = fields[idx]
-                                break
-                            else:
-                                print("❌ Invalid number. Please try again.")
-                                continue
-
-                        if text_field_input in fields:
-                            self.config["text_field"] = text_field_input
-                            break
-                        else:
-                            print("❌ Field not found. Please try again.")
+                    self.config["text_field"] = self._pick_option(
+                        fields,
+                        "Enter field name containing text to read (or number): ",
+                        "Field",
+                    )
                 else:
                     print(f"📁 Using text field from .env: {self.config['text_field']}")
 
                 # Get audio field
                 if not self.config.get("audio_field"):
-                    while True:
-                        audio_field_input = input(
-                            "Enter field name where audio should be added (or number): "
-                        ).strip()
-
-                        if audio_field_input.isdigit():
-                            idx = int(audio_field_input) - 1
-                            if 0 <= idx < len(fields):
-                                self.config["audio_field"] = fields[idx]
-                                break
-                            else:
-                                print("❌ Invalid number. Please try again.")
-                                continue
-
-                        if audio_field_input in fields:
-                            self.config["audio_field"] = audio_field_input
-                            break
-                        else:
-                            print("❌ Field not found. Please try again.")
+                    self.config["audio_field"] = self._pick_option(
+                        fields,
+                        "Enter field name where audio should be added (or number): ",
+                        "Field",
+                    )
                 else:
                     print(
                         f"📁 Using audio field from .env: {self.config['audio_field']}"
@@ -369,17 +512,18 @@ AUDIO_FIELD={self.config.get('audio_field', 'Front')}
         print(f"Voice ID: {self.config['voice_id']}")
         print()
 
-        confirm = input("Is this configuration correct? (y/n): ").strip().lower()
-        if confirm != "y":
+        if not self.confirm("Is this configuration correct? (y/n): "):
             print("❌ Configuration cancelled. Please restart the program.")
             return False
 
-        # Ask if user wants to save configuration
-        save_config = (
-            input("\nSave this configuration to .env file? (y/n): ").strip().lower()
-        )
-        if save_config == "y":
-            self.save_config_to_env()
+        # Ask if user wants to save configuration (skipped in --yes runs,
+        # where the configuration already came from .env)
+        if not self.assume_yes:
+            save_config = (
+                input("\nSave this configuration to .env file? (y/n): ").strip().lower()
+            )
+            if save_config == "y":
+                self.save_config_to_env()
 
         return True
 
@@ -387,6 +531,13 @@ AUDIO_FIELD={self.config.get('audio_field', 'Front')}
         """Initialize ElevenLabs client"""
         try:
             self.elevenlabs_client = ElevenLabs(api_key=self.config["api_key"])
+            # Warm the connection now so the first synthesis request does not
+            # also pay the TLS handshake; the gap between init and the first
+            # card (Gemini generation, prompts) leaves it cold otherwise
+            try:
+                self.elevenlabs_client.voices.get(self.config["voice_id"])
+            except Exception:
+                pass  # Prewarm is best-effort; synthesis will surface real errors
             print("✅ ElevenLabs client initialized successfully")
             return True
         except Exception as e:
@@ -408,12 +559,12 @@ AUDIO_FIELD={self.config.get('audio_field', 'Front')}
     def call_ankiconnect(self, action, params):
         """Call AnkiConnect with error handling"""
         try:
-            response = requests.post(
-                "http://localhost:8765",
-                json={"action": action, "version": 6, "params": params},
+            response = self.http.post(
+                self.ANKI_URL,
+                data=_json_dumps({"action": action, "version": 6, "params": params}),
                 timeout=10,
             )
-            result = response.json()
+            result = _json_loads(response.content)
 
             if result.get("error"):
                 print(f"AnkiConnect error for action '{action}': {result['error']}")
@@ -424,27 +575,91 @@ AUDIO_FIELD={self.config.get('audio_field', 'Front')}
             print(f"ERROR: Unexpected error calling AnkiConnect: {e}")
             return None
 
+    def call_ankiconnect_multi(self, actions):
+        """Run several independent AnkiConnect actions in one HTTP round-trip
+
+        Takes a list of (action, params) tuples and returns the list of
+        per-action result dicts, or None if the batched call itself failed.
+        """
+        result = self.call_ankiconnect(
+            "multi",
+            {
+                "actions": [
+                    {"action": action, "version": 6, "params": params}
+                    for action, params in actions
+                ]
+            },
+        )
+        if not result:
+            return None
+        return result.get("result", [])
+
+    @staticmethod
+    def _multi_result(entry):
+        """Unwrap one entry of a 'multi' response (dict or bare value)"""
+        if isinstance(entry, dict):
+            return entry.get("result")
+        return entry
+
+    @staticmethod
+    def _multi_error(entry):
+        """Error message of one 'multi' response entry, or None"""
+        if isinstance(entry, dict):
+            return entry.get("error")
+        return None
+
     def extract_text_from_field(self, field_value):
         """Extract actual text content from a field, removing any [sound:...] tags and phonetic transcription"""
+        # Fast path: most fields contain no brackets at all, so skip the
+        # regex passes entirely
+        if "[" not in field_value:
+            if "\n" not in field_value:
+                return field_value.strip()
+            return _BLANK_LINE_RE.sub("\n", field_value).strip()
         # Remove sound tags
-        clean_text = re.sub(r"\[sound:[^\]]+\]", "", field_value)
+        clean_text = _SOUND_RE.sub("", field_value)
         # Remove phonetic transcription (text in square brackets that's not a sound tag)
-        clean_text = re.sub(r"\[[^\]]+\](?![^[]*sound)", "", clean_text)
+        clean_text = _BRACKET_RE.sub("", clean_text)
         # Clean up extra whitespace
-        clean_text = re.sub(r"\n\s*\n", "\n", clean_text).strip()
-        return clean_text
+        return _BLANK_LINE_RE.sub("\n", clean_text).strip()
+
+    def _tts_cache_key(self, text):
+        """Hash of the text plus every setting that changes the rendered audio"""
+        payload = json.dumps(
+            {
+                "text": text,
+                "voice_id": self.config["voice_id"],
+                "model_id": self.config.get("tts_model_id", "eleven_turbo_v2_5"),
+                "output_format": self.config.get(
+                    "tts_output_format", "mp3_44100_128"
+                ),
+                "language_code": self.config["language_code"],
+                "stability": 0.8,
+                "similarity_boost": 0.75,
+            },
+            sort_keys=True,
+        )
+        return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
 
     def generate_audio_bytes(self, text):
-        """Generate audio from text using ElevenLabs"""
+        """Generate audio from text using ElevenLabs (with local disk cache)"""
         if not text or not text.strip():
             return None
 
+        # Serve from cache if this exact text/voice/settings tuple was
+        # synthesized before
+        cache_path = self.tts_cache_dir / f"{self._tts_cache_key(text)}.mp3"
+        try:
+            return cache_path.read_bytes()
+        except OSError:
+            pass
+
         try:
             audio_generator = self.elevenlabs_client.text_to_speech.convert(
                 text=text,
                 voice_id=self.config["voice_id"],
-                model_id="eleven_turbo_v2_5",
-                output_format="mp3_44100_128",
+                model_id=self.config.get("tts_model_id", "eleven_turbo_v2_5"),
+                output_format=self.config.get("tts_output_format", "mp3_44100_128"),
                 language_code=self.config["language_code"],
                 voice_settings={
                     "stability": 0.8,
@@ -452,62 +667,148 @@ AUDIO_FIELD={self.config.get('audio_field', 'Front')}
                 },
             )
 
-            # Convert generator to bytes
-            audio_bytes = b"".join(audio_generator)
+            # Accumulate chunks into one growable buffer; b"".join would hold
+            # the chunk list and the result at once (~2x peak memory per call)
+            audio_bytes = bytearray()
+            for chunk in audio_generator:
+                audio_bytes.extend(chunk)
+
+            # Cache atomically (write-then-rename) so a crash never leaves a
+            # truncated mp3 behind; caching failures are non-fatal
+            try:
+                self.tts_cache_dir.mkdir(parents=True, exist_ok=True)
+                tmp_path = cache_path.with_suffix(".tmp")
+                tmp_path.write_bytes(audio_bytes)
+                tmp_path.replace(cache_path)
+            except OSError:
+                pass
+
             return audio_bytes
 
         except Exception as e:
             print(f"ERROR: Failed to generate audio for '{text}': {e}")
             return None
 
-    def update_note_with_audio(self, note, audio_bytes, filename):
-        """Update Anki note with audio file"""
-        try:
-            # Store the audio file
-            encoded_audio = base64.b64encode(audio_bytes).decode("utf-8")
+    def _synth_one(self, word, rate_limiter):
+        """Rate-limited TTS call, run from the worker pool in process_deck
 
-            store_response = self.call_ankiconnect(
-                "storeMediaFile", {"filename": filename, "data": encoded_audio}
-            )
+        The limiter slot is only taken when an ElevenLabs request will
+        actually go out; cache hits return immediately, so a resumed run
+        does not idle one slot per already-synthesized word.
+        """
+        if not word or not word.strip():
+            return None
+        cache_path = self.tts_cache_dir / f"{self._tts_cache_key(word)}.mp3"
+        try:
+            return cache_path.read_bytes()
+        except OSError:
+            pass
+        rate_limiter.acquire()
+        return self.generate_audio_bytes(word)
+
+    def audio_update_actions(self, word, notes, audio_bytes, filename):
+        """Build one storeMediaFile plus an updateNoteFields per note
+
+        All `notes` share the same synthesized audio, so the media file is
+        sent exactly once. When the clip is in the on-disk cache the store
+        action references the file by path and AnkiConnect reads it directly,
+        skipping the base64 payload altogether. The actions are executed
+        later through a batched 'multi' call instead of per-note roundtrips.
+        """
+        try:
+            cache_path = self.tts_cache_dir / f"{self._tts_cache_key(word)}.mp3"
+            if cache_path.is_file():
+                store_params = {"filename": filename, "path": str(cache_path)}
+            else:
+                # memoryview avoids copying the buffer into a bytes object
+                # just to encode it
+                store_params = {
+                    "filename": filename,
+                    "data": base64.b64encode(memoryview(audio_bytes)).decode("ascii"),
+                }
 
-            if store_response is None or store_response.get("error"):
-                return False
+            actions = [("storeMediaFile", store_params)]
 
-            # Get current field content
-            current_content = note["fields"][self.config["audio_field"]]["value"]
+            for note in notes:
+                # Get current field content
+                current_content = note["fields"][self.config["audio_field"]]["value"]
 
-            # Create new content
-            if self.config["audio_field"] == self.config["text_field"]:
-                # Same field: append audio to text
-                clean_text = self.extract_text_from_field(current_content)
-                new_content = f"{clean_text} [sound:{filename}]"
-            else:
-                # Different field: just add audio
-                new_content = f"[sound:{filename}]"
-
-            # Update the field
-            response = self.call_ankiconnect(
-                "updateNoteFields",
-                {
-                    "note": {
-                        "id": note["noteId"],
-                        "fields": {self.config["audio_field"]: new_content},
-                    }
-                },
-            )
+                # Create new content
+                if self.config["audio_field"] == self.config["text_field"]:
+                    # Same field: append audio to text
+                    clean_text = self.extract_text_from_field(current_content)
+                    new_content = f"{clean_text} [sound:{filename}]"
+                else:
+                    # Different field: just add audio
+                    new_content = f"[sound:{filename}]"
+
+                actions.append(
+                    (
+                        "updateNoteFields",
+                        {
+                            "note": {
+                                "id": note["noteId"],
+                                "fields": {self.config["audio_field"]: new_content},
+                            }
+                        },
+                    )
+                )
 
-            return response is not None and not response.get("error")
+            return actions
 
         except Exception as e:
-            print(f"ERROR: Exception while updating note {note['noteId']}: {e}")
-            return False
+            print(f"ERROR: Exception while updating notes: {e}")
+            return None
+
+    def flush_audio_updates(self, actions, groups):
+        """Submit accumulated store/update actions in one 'multi' call
+
+        `groups` lists the note ids behind each store action, in order.
+        Returns (success_count, error_count) over the flushed notes.
+        """
+        if not groups:
+            return 0, 0
+
+        total = sum(len(group) for group in groups)
+        results = self.call_ankiconnect_multi(actions)
+        if results is None or len(results) < len(actions):
+            return 0, total
+
+        success_count = 0
+        error_count = 0
+        pos = 0
+        for group in groups:
+            store_err = self._multi_error(results[pos])
+            pos += 1
+            for note_id in group:
+                update_err = self._multi_error(results[pos])
+                pos += 1
+                if store_err or update_err:
+                    print(
+                        f"ERROR: Failed to update note {note_id}: "
+                        f"{store_err or update_err}"
+                    )
+                    error_count += 1
+                else:
+                    success_count += 1
+                    self._done_notes[note_id] = None
+                    self._done_notes.move_to_end(note_id)
+                    if len(self._done_notes) > 100_000:
+                        self._done_notes.popitem(last=False)
+
+        return success_count, error_count
 
     def analyze_deck_content(self):
         """Analyze current deck content and return summary for Gemini"""
+        deck_name = self.config["deck_name"]
+        cached = self._deck_summary_cache.get(deck_name)
+        if cached is not None:
+            return cached
+
         try:
             # Get notes from deck
             result = self.call_ankiconnect(
-                "findNotes", {"query": f'deck:"{self.config["deck_name"]}"'}
+                "findNotes", {"query": f'deck:"{deck_name}"'}
             )
             if not result:
                 return "No existing content found in deck."
@@ -516,29 +817,42 @@ AUDIO_FIELD={self.config.get('audio_field', 'Front')}
             if not note_ids:
                 return "No existing content found in deck."
 
-            # Get note information
-            result = self.call_ankiconnect("notesInfo", {"notes": note_ids})
+            # Only the first 50 notes are used for context, so only fetch
+            # those — payload stays constant no matter how big the deck is
+            result = self.call_ankiconnect("notesInfo", {"notes": note_ids[:50]})
             if not result:
                 return "Could not retrieve deck content."
 
             notes = result.get("result", [])
 
-            # Extract text content
-            existing_words = []
-            for note in notes[:50]:  # Limit to first 50 notes for context
-                try:
-                    raw_field_value = note["fields"][self.config["text_field"]]["value"]
+            # The summary only shows 20 sample words, so stop extracting (and
+            # running the field-cleaning regexes) as soon as we have them
+            def note_words():
+                for note in notes:
+                    try:
+                        raw_field_value = note["fields"][self.config["text_field"]][
+                            "value"
+                        ]
+                    except (KeyError, TypeError):
+                        continue
                     word = self.extract_text_from_field(raw_field_value)
                     if word and word.strip():
-                        existing_words.append(word.strip())
-                except:
-                    continue
+                        yield word.strip()
+
+            sample_words = list(islice(note_words(), 20))
+            extra = len(notes) - len(sample_words)
+
+            # Only the extracted strings are needed from here on; drop the
+            # full note dicts (all fields, tags, cards) before building the
+            # summary so they can be collected
+            del result, notes
 
             # Create summary for Gemini
-            summary = f"Current deck contains {len(notes)} cards with these sample words/phrases: {', '.join(existing_words[:20])}"
-            if len(existing_words) > 20:
-                summary += f" (and {len(existing_words) - 20} more)"
+            summary = f"Current deck contains {len(note_ids)} cards with these sample words/phrases: {', '.join(sample_words)}"
+            if extra > 0:
+                summary += f" (and {extra} more)"
 
+            self._deck_summary_cache[deck_name] = summary
             return summary
 
         except Exception as e:
@@ -553,12 +867,15 @@ AUDIO_FIELD={self.config.get('audio_field', 'Front')}
             target_lang = self.config.get("target_language", "de")
             mother_lang = self.config.get("mother_language", "en")
 
+            # The static instruction block and deck context lead the prompt and
+            # the per-call topic/word inputs come last, so Gemini's implicit
+            # context caching can reuse the shared prefix across calls in a run
             if word_list:
                 # User provided specific words - generate translations and phrases
                 words_str = ", ".join(word_list)
                 prompt = f"""
-                For these {target_lang.upper()} words: {words_str}
-                
+                You will be given a list of {target_lang.upper()} words.
+
                 Requirements:
                 - For EACH word, provide the {mother_lang.upper()} translation and IPA phonetic transcription
                 - Words should include the article if it's a noun (e.g., der Mann, die Frau, das Kind)
@@ -575,18 +892,20 @@ AUDIO_FIELD={self.config.get('audio_field', 'Front')}
                         ...
                     ]
                 }}
-                
+
                 Make sure phrases are practical and demonstrate actual usage of these words.
                 Include accurate IPA phonetic notation for proper pronunciation.
+
+                The words: {words_str}
                 """
             else:
                 # Original topic-based generation
                 prompt = f"""
-                Generate {target_lang.upper()} vocabulary for the topic: "{topic}"
-                
+                Generate {target_lang.upper()} vocabulary for a given topic.
+
                 Requirements:
-                - Generate {num_words} {target_lang.upper()} words with {mother_lang.upper()} translations and IPA phonetic transcription
-                - Generate {num_phrases} {target_lang.upper()} phrases with {mother_lang.upper()} translations and IPA phonetic transcription
+                - Generate the requested number of {target_lang.upper()} words with {mother_lang.upper()} translations and IPA phonetic transcription
+                - Generate the requested number of {target_lang.upper()} phrases with {mother_lang.upper()} translations and IPA phonetic transcription
                 - Words are always accompanied by the article — for example, der Mann (the man).
                 - Include IPA phonetic notation for pronunciation
                 - Format as JSON with this structure:
@@ -600,25 +919,24 @@ AUDIO_FIELD={self.config.get('audio_field', 'Front')}
                         ...
                     ]
                 }}
-                
-                Context from existing deck: {existing_content}
-                
+
                 Make sure the content is relevant to the topic and appropriate for language learning.
                 Avoid duplicating words/phrases that might already be in the deck.
                 Include accurate IPA phonetic notation for proper pronunciation.
-                """
 
-            response = self.gemini_client.generate_content(prompt)
+                Context from existing deck: {existing_content}
 
-            # Parse JSON response
-            content = response.text.strip()
-            # Remove markdown code blocks if present
-            if content.startswith("```json"):
-                content = content[7:]
-            if content.endswith("```"):
-                content = content[:-3]
+                Topic: "{topic}"
+                Generate {num_words} words and {num_phrases} phrases.
+                """
 
-            return json.loads(content)
+            # JSON mode guarantees a parsable object, so no markdown-fence
+            # stripping and no wasted regeneration on prose-wrapped output
+            response = self.gemini_client.generate_content(
+                prompt, generation_config=_JSON_GENERATION_CONFIG
+            )
+
+            return json.loads(response.text)
 
         except Exception as e:
             print(f"ERROR: Failed to generate German content: {e}")
@@ -657,52 +975,78 @@ AUDIO_FIELD={self.config.get('audio_field', 'Front')}
             Existing deck context: {existing_content}
             """
 
-            response = self.gemini_client.generate_content(prompt).text.strip()
-
-            # Clean markdown formatting
-            response = response.removeprefix("```json").removesuffix("```").strip()
-            return json.loads(response)
+            response = self.gemini_client.generate_content(
+                prompt, generation_config=_JSON_GENERATION_CONFIG
+            )
+            return json.loads(response.text)
 
         except Exception as e:
             print(f"❌ Grammar generation failed: {e}")
             return None
 
-    def create_anki_cards(self, content_data):
-        """Create new Anki cards from generated content"""
-        if not content_data:
-            return False
-
-        success_count = 0
-        error_count = 0
+    def _ensure_deck_and_model(self):
+        """Make sure the configured deck exists and return the model to use
+
+        The deckNames/createDeck/modelNames bootstrap is identical for the
+        vocabulary and grammar creators, so its outcome is memoized per deck —
+        the second card run in a session costs zero AnkiConnect round-trips.
+        """
+        deck_name = self.config["deck_name"]
+        model_name = self._deck_model_cache.get(deck_name)
+        if model_name:
+            return model_name
+
+        # Fetch deck and model names in a single batched round-trip
+        meta = self.call_ankiconnect_multi([("deckNames", {}), ("modelNames", {})])
+        if not meta or len(meta) < 2:
+            print("❌ Could not get available decks")
+            return None
 
-        # Check if deck exists, create if it doesn't
-        decks = self.call_ankiconnect("deckNames", {})
-        if not decks or not decks.get("result"):
+        deck_names = self._multi_result(meta[0])
+        model_names = self._multi_result(meta[1])
+        if not deck_names:
             print("❌ Could not get available decks")
-            return False
+            return None
 
-        if self.config["deck_name"] not in decks["result"]:
-            print(f"📁 Deck '{self.config['deck_name']}' not found, creating it...")
-            create_result = self.call_ankiconnect(
-                "createDeck", {"deck": self.config["deck_name"]}
-            )
+        # Check if deck exists, create if it doesn't
+        if deck_name not in deck_names:
+            print(f"📁 Deck '{deck_name}' not found, creating it...")
+            create_result = self.call_ankiconnect("createDeck", {"deck": deck_name})
             if not create_result or create_result.get("error"):
                 print(
                     f"❌ Failed to create deck: {create_result.get('error', 'Unknown error')}"
                 )
-                return False
-            print(f"✅ Created deck '{self.config['deck_name']}'")
+                return None
+            print(f"✅ Created deck '{deck_name}'")
 
-        # Get model name for the deck
-        models = self.call_ankiconnect("modelNames", {})
-        if not models or not models.get("result"):
+        # Use the first available model (usually Basic)
+        if not model_names:
             print("❌ Could not get available models")
+            return None
+        model_name = model_names[0]
+        self._deck_model_cache[deck_name] = model_name
+        return model_name
+
+    def create_anki_cards(self, content_data):
+        """Create new Anki cards from generated content"""
+        if not content_data:
             return False
 
-        # Use the first available model (usually Basic)
-        model_name = models["result"][0]
+        success_count = 0
+        error_count = 0
+
+        model_name = self._ensure_deck_and_model()
+        if not model_name:
+            return False
 
-        # Create cards for words
+        deck_name = self.config["deck_name"]
+        text_field = self.config["text_field"]
+
+        # Build every note first, then add them in a single addNotes call —
+        # one AnkiConnect roundtrip instead of one per card
+        notes_list = []
+
+        # Cards for words
         for word_data in content_data.get("words", []):
             try:
                 # Include phonetic transcription in the front display
@@ -716,27 +1060,23 @@ AUDIO_FIELD={self.config.get('audio_field', 'Front')}
                 if phonetic:
                     back_content += f"\n\nPronunciation: [{phonetic}]"
 
-                note = {
-                    "deckName": self.config["deck_name"],
-                    "modelName": model_name,
-                    "fields": {
-                        self.config["text_field"]: front_content,
-                        "Back": back_content,
-                    },
-                    "tags": ["generated", "german"],
-                }
-
-                response = self.call_ankiconnect("addNote", {"note": note})
-                if response and not response.get("error"):
-                    success_count += 1
-                else:
-                    error_count += 1
+                notes_list.append(
+                    {
+                        "deckName": deck_name,
+                        "modelName": model_name,
+                        "fields": {
+                            text_field: front_content,
+                            "Back": back_content,
+                        },
+                        "tags": ["generated", "german"],
+                    }
+                )
 
             except Exception as e:
                 print(f"ERROR creating word card: {e}")
                 error_count += 1
 
-        # Create cards for phrases
+        # Cards for phrases
         for phrase_data in content_data.get("phrases", []):
             try:
                 # Include phonetic transcription in the front display
@@ -750,30 +1090,39 @@ AUDIO_FIELD={self.config.get('audio_field', 'Front')}
                 if phonetic:
                     back_content += f"\n\nPronunciation: [{phonetic}]"
 
-                note = {
-                    "deckName": self.config["deck_name"],
-                    "modelName": model_name,
-                    "fields": {
-                        self.config["text_field"]: front_content,
-                        "Back": back_content,
-                    },
-                    "tags": ["generated", "german", "phrase"],
-                }
-
-                response = self.call_ankiconnect("addNote", {"note": note})
-                if response and not response.get("error"):
-                    success_count += 1
-                else:
-                    error_count += 1
+                notes_list.append(
+                    {
+                        "deckName": deck_name,
+                        "modelName": model_name,
+                        "fields": {
+                            text_field: front_content,
+                            "Back": back_content,
+                        },
+                        "tags": ["generated", "german", "phrase"],
+                    }
+                )
 
             except Exception as e:
                 print(f"ERROR creating phrase card: {e}")
                 error_count += 1
 
+        if notes_list:
+            response = self.call_ankiconnect("addNotes", {"notes": notes_list})
+            if response:
+                # AnkiConnect returns None in place of each rejected note
+                note_ids = response.get("result") or []
+                success_count = sum(1 for note_id in note_ids if note_id is not None)
+                error_count += len(notes_list) - success_count
+            else:
+                error_count += len(notes_list)
+
         print(f"✅ Created {success_count} new cards")
         if error_count > 0:
             print(f"⚠️  {error_count} cards failed to create")
 
+        if success_count:
+            # The cached deck summary no longer reflects the deck
+            self._deck_summary_cache.pop(self.config["deck_name"], None)
         return success_count > 0
 
     def create_grammar_cards(self, content_data):
@@ -784,75 +1133,56 @@ AUDIO_FIELD={self.config.get('audio_field', 'Front')}
         success_count = 0
         error_count = 0
 
-        # Check if deck exists, create if it doesn't
-        decks = self.call_ankiconnect("deckNames", {})
-        if not decks or not decks.get("result"):
-            print("❌ Could not get available decks")
-            return False
-
-        if self.config["deck_name"] not in decks["result"]:
-            print(f"📁 Deck '{self.config['deck_name']}' not found, creating it...")
-            create_result = self.call_ankiconnect(
-                "createDeck", {"deck": self.config["deck_name"]}
-            )
-            if not create_result or create_result.get("error"):
-                print(
-                    f"❌ Failed to create deck: {create_result.get('error', 'Unknown error')}"
-                )
-                return False
-            print(f"✅ Created deck '{self.config['deck_name']}'")
-
-        # Get model name for the deck
-        models = self.call_ankiconnect("modelNames", {})
-        if not models or not models.get("result"):
-            print("❌ Could not get available models")
+        model_name = self._ensure_deck_and_model()
+        if not model_name:
             return False
 
-        # Use the first available model (usually Basic)
-        model_name = models["result"][0]
+        deck_name = self.config["deck_name"]
+        text_field = self.config["text_field"]
 
-        # Create cards for grammar rules
+        # Build every grammar note first, then add them in a single addNotes
+        # call — one AnkiConnect roundtrip instead of one per card
+        notes_list = []
         for rule_data in content_data.get("grammar_rules", []):
             try:
-                # Create comprehensive content for the front of the card
-                front_content = f"{rule_data['rule']}\n\n{rule_data['example']}"
-
-                # Create detailed back content with all information
-                back_content = f"""<b>Rule:</b> {rule_data['rule']}
-
-<b>Explanation:</b> {rule_data['explanation']}
-
-<b>Pronunciation Tip:</b> {rule_data['pronunciation_tip']}
-
-<b>Example:</b> {rule_data['example']}
-<b>Pronunciation:</b> {rule_data['example_pronunciation']}
-
-<b>Memory Tip:</b> {rule_data['memory_tip']}"""
-
-                note = {
-                    "deckName": self.config["deck_name"],
-                    "modelName": model_name,
-                    "fields": {
-                        self.config["text_field"]: front_content,
-                        "Back": back_content,
-                    },
-                    "tags": ["generated", "german", "grammar", "pronunciation"],
-                }
-
-                response = self.call_ankiconnect("addNote", {"note": note})
-                if response and not response.get("error"):
-                    success_count += 1
-                else:
-                    error_count += 1
+                # A missing key raises KeyError here just like the old
+                # per-field indexing did
+                front_content = _GRAMMAR_FRONT_TMPL.format_map(rule_data)
+                back_content = _GRAMMAR_BACK_TMPL.format_map(rule_data)
+
+                notes_list.append(
+                    {
+                        "deckName": deck_name,
+                        "modelName": model_name,
+                        "fields": {
+                            text_field: front_content,
+                            "Back": back_content,
+                        },
+                        "tags": ["generated", "german", "grammar", "pronunciation"],
+                    }
+                )
 
             except Exception as e:
                 print(f"ERROR creating grammar card: {e}")
                 error_count += 1
 
+        if notes_list:
+            response = self.call_ankiconnect("addNotes", {"notes": notes_list})
+            if response:
+                # AnkiConnect returns None in place of each rejected note
+                note_ids = response.get("result") or []
+                success_count = sum(1 for note_id in note_ids if note_id is not None)
+                error_count += len(notes_list) - success_count
+            else:
+                error_count += len(notes_list)
+
         print(f"✅ Created {success_count} new grammar cards")
         if error_count > 0:
             print(f"⚠️  {error_count} cards failed to create")
 
+        if success_count:
+            # The cached deck summary no longer reflects the deck
+            self._deck_summary_cache.pop(self.config["deck_name"], None)
         return success_count > 0
 
     def generate_and_add_content(self):
@@ -941,33 +1271,32 @@ AUDIO_FIELD={self.config.get('audio_field', 'Front')}
             print("❌ Failed to generate content")
             return False
 
-        # Show preview
+        # Show preview; bind the lists once and islice the previews so the
+        # code stays generator-friendly should generation ever stream
+        words = content_data.get("words", [])
+        phrases = content_data.get("phrases", [])
+
         print(f"\n📝 Generated content preview:")
         print("Words:")
-        for word in content_data.get("words", [])[:3]:
+        for word in islice(words, 3):
             phonetic = word.get("phonetic", "")
             phonetic_display = f" [{phonetic}]" if phonetic else ""
             print(f"  {word['german']}{phonetic_display} = {word['english']}")
-        if len(content_data.get("words", [])) > 3:
-            print(f"  ... and {len(content_data['words']) - 3} more words")
+        if len(words) > 3:
+            print(f"  ... and {len(words) - 3} more words")
 
         print("\nPhrases:")
-        for phrase in content_data.get("phrases", [])[:2]:
+        for phrase in islice(phrases, 2):
             phonetic = phrase.get("phonetic", "")
             phonetic_display = f" [{phonetic}]" if phonetic else ""
             print(f"  {phrase['german']}{phonetic_display} = {phrase['english']}")
-        if len(content_data.get("phrases", [])) > 2:
-            print(f"  ... and {len(content_data['phrases']) - 2} more phrases")
+        if len(phrases) > 2:
+            print(f"  ... and {len(phrases) - 2} more phrases")
 
         # Confirm creation
-        confirm = (
-            input(
-                f"\nCreate {len(content_data.get('words', [])) + len(content_data.get('phrases', []))} new cards? (y/n): "
-            )
-            .strip()
-            .lower()
-        )
-        if confirm != "y":
+        if not self.confirm(
+            f"\nCreate {len(content_data.get('words', [])) + len(content_data.get('phrases', []))} new cards? (y/n): "
+        ):
             print("❌ Card creation cancelled")
             return False
 
@@ -978,14 +1307,16 @@ AUDIO_FIELD={self.config.get('audio_field', 'Front')}
         if success:
             print("✅ Content generation and card creation complete!")
 
-            # Ask if user wants to add audio
-            add_audio = (
-                input("\nWould you like to add audio to the new cards? (y/n): ")
-                .strip()
-                .lower()
-            )
-            if add_audio == "y":
-                return self.process_deck()
+            # Ask if user wants to add audio (in non-interactive runs the
+            # audio phase is driven by --action instead)
+            if self.interactive:
+                add_audio = (
+                    input("\nWould you like to add audio to the new cards? (y/n): ")
+                    .strip()
+                    .lower()
+                )
+                if add_audio == "y":
+                    return self.process_deck()
 
         return success
 
@@ -1025,24 +1356,20 @@ AUDIO_FIELD={self.config.get('audio_field', 'Front')}
             return False
 
         # Show preview
+        grammar_rules = content_data.get("grammar_rules", [])
         print(f"\n📝 Generated grammar content preview:")
-        for i, rule in enumerate(content_data.get("grammar_rules", [])[:2], 1):
+        for i, rule in enumerate(islice(grammar_rules, 2), 1):
             print(f"\n{i}. {rule['rule']}")
             print(f"   Example: {rule['example']}")
             print(f"   Pronunciation: {rule['example_pronunciation']}")
 
-        if len(content_data.get("grammar_rules", [])) > 2:
-            print(f"   ... and {len(content_data['grammar_rules']) - 2} more rules")
+        if len(grammar_rules) > 2:
+            print(f"   ... and {len(grammar_rules) - 2} more rules")
 
         # Confirm creation
-        confirm = (
-            input(
-                f"\nCreate {len(content_data.get('grammar_rules', []))} new grammar cards? (y/n): "
-            )
-            .strip()
-            .lower()
-        )
-        if confirm != "y":
+        if not self.confirm(
+            f"\nCreate {len(content_data.get('grammar_rules', []))} new grammar cards? (y/n): "
+        ):
             print("❌ Card creation cancelled")
             return False
 
@@ -1053,85 +1380,214 @@ AUDIO_FIELD={self.config.get('audio_field', 'Front')}
         if success:
             print("✅ Grammar content generation and card creation complete!")
 
-            # Ask if user wants to add audio
-            add_audio = (
-                input("\nWould you like to add audio to the new cards? (y/n): ")
-                .strip()
-                .lower()
-            )
-            if add_audio == "y":
-                return self.process_deck()
+            # Ask if user wants to add audio (in non-interactive runs the
+            # audio phase is driven by --action instead)
+            if self.interactive:
+                add_audio = (
+                    input("\nWould you like to add audio to the new cards? (y/n): ")
+                    .strip()
+                    .lower()
+                )
+                if add_audio == "y":
+                    return self.process_deck()
 
         return success
 
     def process_deck(self):
         """Process all cards in the deck"""
-        print(f"\n🎵 Step 3: Processing Deck '{self.config['deck_name']}'")
+        # Bind the hot config values to locals once; the per-note loop below
+        # touches them thousands of times
+        deck_name = self.config["deck_name"]
+        text_field = self.config["text_field"]
+        audio_field = self.config["audio_field"]
+
+        print(f"\n🎵 Step 3: Processing Deck '{deck_name}'")
         print("=" * 50)
 
-        # Get notes from deck
-        result = self.call_ankiconnect(
-            "findNotes", {"query": f'deck:"{self.config["deck_name"]}"'}
-        )
+        # Get notes from deck, excluding cards that already have audio —
+        # filtering server-side keeps the notesInfo payload proportional to
+        # the remaining work instead of the whole deck on re-runs
+        query = f'deck:"{deck_name}" -"{audio_field}:*[sound:*"'
+        result = self.call_ankiconnect("findNotes", {"query": query})
         if not result:
             print("❌ Failed to get notes from deck")
             return False
 
         note_ids = result.get("result", [])
+        # Skip notes finished earlier this session — the search index may not
+        # reflect very recent updates yet
+        note_ids = [note_id for note_id in note_ids if note_id not in self._done_notes]
         if not note_ids:
-            print(f"❌ No notes found in deck '{self.config['deck_name']}'")
-            return False
-
-        # Get note information
-        result = self.call_ankiconnect("notesInfo", {"notes": note_ids})
-        if not result:
-            print("❌ Failed to get note information")
+            # Distinguish "everything already has audio" — the normal,
+            # idempotent re-run — from a missing or empty deck
+            deck_check = self.call_ankiconnect(
+                "findNotes", {"query": f'deck:"{deck_name}"'}
+            )
+            if deck_check and deck_check.get("result"):
+                print(f"✅ All notes in deck '{deck_name}' already have audio")
+                return True
+            print(f"❌ No notes found in deck '{deck_name}'")
             return False
 
-        notes = result.get("result", [])
-        print(f"✅ Found {len(notes)} cards in deck")
+        print(f"✅ Found {len(note_ids)} cards to process")
 
         # Process notes
         success_count = 0
         error_count = 0
         skip_count = 0
 
-        for note in tqdm(notes, desc="Processing cards"):
-            try:
-                # Extract text
-                raw_field_value = note["fields"][self.config["text_field"]]["value"]
-                word = self.extract_text_from_field(raw_field_value)
-
-                if not word or not word.strip():
-                    skip_count += 1
+        # Synthesize in parallel. TTS is latency-bound, so a small worker
+        # pool overlaps the network waits; the rate limiter keeps us inside
+        # the ElevenLabs requests-per-second allowance. Anki updates stay on
+        # this thread — AnkiConnect is not safe to hit concurrently.
+        rate_limiter = RateLimiter(float(self.config.get("tts_rate_per_sec", 2)))
+        max_workers = int(self.config.get("tts_concurrency", 4))
+
+        # notesInfo is fetched in batches so peak memory is bounded by the
+        # batch size, not the deck size
+        batch_size = 500
+
+        # Completed audios are written back through batched 'multi' calls —
+        # one roundtrip per flush instead of two per note
+        flush_every = 32
+        pending_actions = []
+        pending_groups = []
+        pending_count = 0
+
+        # Identical text is synthesized exactly once per run: notes sharing a
+        # text wait on the same future and share one media file named after
+        # the content hash
+        inflight = {}
+
+        # Cap bar redraws (~200 over the run) so cached-TTS hits aren't
+        # bottlenecked on tqdm's lock, and drop the bar when not on a TTY
+        progress = tqdm(
+            total=len(note_ids),
+            desc="Processing cards",
+            mininterval=0.2,
+            miniters=max(1, len(note_ids) // 200),
+            disable=not sys.stderr.isatty(),
+        )
+        # Managed manually (not as a context manager) so a Ctrl-C can cancel
+        # the queued synthesis instead of blocking until it all finishes
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        batch_futures = {}
+        processed = set()
+        try:
+            for start in range(0, len(note_ids), batch_size):
+                batch_ids = note_ids[start : start + batch_size]
+
+                result = self.call_ankiconnect("notesInfo", {"notes": batch_ids})
+                if not result:
+                    print("❌ Failed to get note information")
+                    error_count += len(batch_ids)
+                    progress.update(len(batch_ids))
                     continue
 
-                # Check if audio already exists
-                audio_field_value = note["fields"][self.config["audio_field"]]["value"]
-                if "[sound:" in audio_field_value:
-                    skip_count += 1
-                    continue
+                # Collect the notes in this batch that actually need audio,
+                # grouped by the future synthesizing their text
+                batch_futures = {}
+                processed = set()
+                for note in result.get("result", []):
+                    # A note whose model lacks the configured fields (mixed
+                    # note-type decks) counts as an error instead of letting
+                    # the exception abort the run and drop pending flushes
+                    try:
+                        raw_field_value = note["fields"][text_field]["value"]
+                        audio_field_value = note["fields"][audio_field]["value"]
+                    except (KeyError, TypeError):
+                        error_count += 1
+                        progress.update(1)
+                        continue
 
-                # Generate and add audio
-                filename = f"{note['noteId']}.mp3"
-                audio = self.generate_audio_bytes(word)
+                    word = self.extract_text_from_field(raw_field_value)
 
-                if audio:
-                    if self.update_note_with_audio(note, audio, filename):
-                        success_count += 1
+                    if not word or not word.strip():
+                        skip_count += 1
+                        progress.update(1)
+                        continue
+
+                    # Check if audio already exists
+                    if "[sound:" in audio_field_value:
+                        skip_count += 1
+                        progress.update(1)
+                        continue
+
+                    future = inflight.get(word)
+                    if future is None:
+                        future = executor.submit(self._synth_one, word, rate_limiter)
+                        inflight[word] = future
+                    batch_futures.setdefault(future, (word, []))[1].append(note)
+
+                for future in as_completed(batch_futures):
+                    processed.add(future)
+                    word, group_notes = batch_futures[future]
+                    try:
+                        audio = future.result()
+                    except Exception as e:
+                        print(f"ERROR: Unexpected error processing note: {e}")
+                        error_count += len(group_notes)
+                        progress.update(len(group_notes))
+                        continue
+
+                    if audio:
+                        filename = f"tts_{self._tts_cache_key(word)}.mp3"
+                        actions = self.audio_update_actions(
+                            word, group_notes, audio, filename
+                        )
+                        if actions:
+                            pending_actions.extend(actions)
+                            pending_groups.append(
+                                [note["noteId"] for note in group_notes]
+                            )
+                            pending_count += len(group_notes)
+                        else:
+                            error_count += len(group_notes)
                     else:
-                        error_count += 1
-                else:
-                    error_count += 1
+                        error_count += len(group_notes)
+                    progress.update(len(group_notes))
 
-                time.sleep(0.5)  # Rate limiting
+                    if pending_count >= flush_every:
+                        ok, bad = self.flush_audio_updates(
+                            pending_actions, pending_groups
+                        )
+                        success_count += ok
+                        error_count += bad
+                        pending_actions = []
+                        pending_groups = []
+                        pending_count = 0
+
+        except KeyboardInterrupt:
+            # Cancel queued synthesis but keep every finished clip: the final
+            # flush below writes them to Anki so the spend isn't wasted
+            print("\n⚠️ Process interrupted by user. Saving finished audio...")
+            executor.shutdown(wait=False, cancel_futures=True)
+            for future, (word, group_notes) in batch_futures.items():
+                if future in processed or not future.done() or future.cancelled():
+                    continue
+                try:
+                    audio = future.result()
+                except Exception:
+                    continue
+                if audio:
+                    filename = f"tts_{self._tts_cache_key(word)}.mp3"
+                    actions = self.audio_update_actions(
+                        word, group_notes, audio, filename
+                    )
+                    if actions:
+                        pending_actions.extend(actions)
+                        pending_groups.append(
+                            [note["noteId"] for note in group_notes]
+                        )
+        finally:
+            executor.shutdown(wait=True)
+            progress.close()
 
-            except KeyboardInterrupt:
-                print("\n⚠️ Process interrupted by user.")
-                break
-            except Exception as e:
-                print(f"ERROR: Unexpected error processing note: {e}")
-                error_count += 1
+        # Flush whatever is still pending (also covers the interrupted case,
+        # so already-synthesized audio is not thrown away)
+        ok, bad = self.flush_audio_updates(pending_actions, pending_groups)
+        success_count += ok
+        error_count += bad
 
         # Print results
         print(f"\n🎉 Processing Complete!")
@@ -1142,6 +1598,22 @@ AUDIO_FIELD={self.config.get('audio_field', 'Front')}
 
         return True
 
+    def _prompt_updates(self, fields):
+        """Prompt for each (config_key, prompt) pair in `fields`
+
+        Blank input keeps the current value, mirroring the old hand-rolled
+        if-blocks; the loop replaces one such block per setting.
+        """
+        for cfg_name, prompt in fields:
+            value = input(prompt).strip()
+            if value:
+                self.config[cfg_name] = value
+
+    def _offer_save(self):
+        """Shared save-to-.env prompt used by every configure_* screen"""
+        if input("\nSave these settings? (y/n): ").strip().lower() == "y":
+            self.save_config_to_env()
+
     def configure_deck_settings(self):
         """Configure deck and field settings"""
         print("\n📚 Deck and Field Configuration")
@@ -1155,25 +1627,9 @@ AUDIO_FIELD={self.config.get('audio_field', 'Front')}
                 print(f"  {i}. {deck}")
             print()
 
-            while True:
-                deck_input = input(
-                    "Enter deck name (or number from list above): "
-                ).strip()
-
-                if deck_input.isdigit():
-                    idx = int(deck_input) - 1
-                    if 0 <= idx < len(decks):
-                        self.config["deck_name"] = decks[idx]
-                        break
-                    else:
-                        print("❌ Invalid number. Please try again.")
-                        continue
-
-                if deck_input in decks:
-                    self.config["deck_name"] = deck_input
-                    break
-                else:
-                    print("❌ Deck not found. Please try again.")
+            self.config["deck_name"] = self._pick_option(
+                decks, "Enter deck name (or number from list above): ", "Deck"
+            )
         else:
             self.config["deck_name"] = input("Enter Anki deck name: ").strip()
 
@@ -1186,46 +1642,18 @@ AUDIO_FIELD={self.config.get('audio_field', 'Front')}
             print()
 
             # Text field
-            while True:
-                text_field_input = input(
-                    "Enter field name containing text to read (or number): "
-                ).strip()
-
-                if text_field_input.isdigit():
-                    idx = int(text_field_input) - 1
-                    if 0 <= idx < len(fields):
-                        self.config["text_field"] = fields[idx]
-                        break
-                    else:
-                        print("❌ Invalid number. Please try again.")
-                        continue
-
-                if text_field_input in fields:
-                    self.config["text_field"] = text_field_input
-                    break
-                else:
-                    print("❌ Field not found. Please try again.")
+            self.config["text_field"] = self._pick_option(
+                fields,
+                "Enter field name containing text to read (or number): ",
+                "Field",
+            )
 
             # Audio field
-            while True:
-                audio_field_input = input(
-                    "Enter field name where audio should be added (or number): "
-                ).strip()
-
-                if audio_field_input.isdigit():
-                    idx = int(audio_field_input) - 1
-                    if 0 <= idx < len(fields):
-                        self.config["audio_field"] = fields[idx]
-                        break
-                    else:
-                        print("❌ Invalid number. Please try again.")
-                        continue
-
-                if audio_field_input in fields:
-                    self.config["audio_field"] = audio_field_input
-                    break
-                else:
-                    print("❌ Field not found. Please try again.")
+            self.config["audio_field"] = self._pick_option(
+                fields,
+                "Enter field name where audio should be added (or number): ",
+                "Field",
+            )
         else:
             self.config["text_field"] = input(
                 "Enter field name containing text to read: "
@@ -1239,63 +1667,55 @@ AUDIO_FIELD={self.config.get('audio_field', 'Front')}
         print(f"   Text field: {self.config['text_field']}")
         print(f"   Audio field: {self.config['audio_field']}")
 
-        save = input("\nSave these settings? (y/n): ").strip().lower()
-        if save == "y":
-            self.save_config_to_env()
+        self._offer_save()
 
     def configure_language_settings(self):
         """Configure language settings"""
         print("\n🌍 Language Configuration")
         print("=" * 30)
 
-        # Target language
-        target_language = input(
-            f"Enter target language code (currently: {self.config.get('target_language', 'de')}) [de]: "
-        ).strip()
-        if target_language:
-            self.config["target_language"] = target_language
-            self.config["language_code"] = target_language
-
-        # Mother language
-        mother_language = input(
-            f"Enter mother language code (currently: {self.config.get('mother_language', 'en')}) [en]: "
-        ).strip()
-        if mother_language:
-            self.config["mother_language"] = mother_language
+        self._prompt_updates(
+            (
+                (
+                    "target_language",
+                    f"Enter target language code (currently: {self.config.get('target_language', 'de')}) [de]: ",
+                ),
+                (
+                    "mother_language",
+                    f"Enter mother language code (currently: {self.config.get('mother_language', 'en')}) [en]: ",
+                ),
+            )
+        )
+        if self.config.get("target_language"):
+            self.config["language_code"] = self.config["target_language"]
 
         print(f"\n✅ Updated language settings:")
         print(f"   Target language: {self.config['target_language']}")
         print(f"   Mother language: {self.config['mother_language']}")
 
-        save = input("\nSave these settings? (y/n): ").strip().lower()
-        if save == "y":
-            self.save_config_to_env()
+        self._offer_save()
 
     def configure_api_settings(self):
         """Configure API settings"""
         print("\n🔑 API Configuration")
         print("=" * 25)
 
-        # Gemini API
-        gemini_key = input(
-            f"Enter Gemini API key (currently: {'*' * 20 if self.config.get('gemini_api_key') else 'Not set'}): "
-        ).strip()
-        if gemini_key:
-            self.config["gemini_api_key"] = gemini_key
-
-        # ElevenLabs API
-        elevenlabs_key = input(
-            f"Enter ElevenLabs API key (currently: {'*' * 20 if self.config.get('api_key') else 'Not set'}): "
-        ).strip()
-        if elevenlabs_key:
-            self.config["api_key"] = elevenlabs_key
-
-        # Voice ID
-        voice_id = input(
-            f"Enter ElevenLabs voice ID (currently: {self.config.get('voice_id', 'Not set')}): "
-        ).strip()
-        if voice_id:
-            self.config["voice_id"] = voice_id
+        self._prompt_updates(
+            (
+                (
+                    "gemini_api_key",
+                    f"Enter Gemini API key (currently: {'*' * 20 if self.config.get('gemini_api_key') else 'Not set'}): ",
+                ),
+                (
+                    "api_key",
+                    f"Enter ElevenLabs API key (currently: {'*' * 20 if self.config.get('api_key') else 'Not set'}): ",
+                ),
+                (
+                    "voice_id",
+                    f"Enter ElevenLabs voice ID (currently: {self.config.get('voice_id', 'Not set')}): ",
+                ),
+            )
+        )
 
         print(f"\n✅ Updated API settings:")
         print(
@@ -1306,9 +1726,7 @@ AUDIO_FIELD={self.config.get('audio_field', 'Front')}
         )
         print(f"   Voice ID: {self.config.get('voice_id', 'Not set')}")
 
-        save = input("\nSave these settings? (y/n): ").strip().lower()
-        if save == "y":
-            self.save_config_to_env()
+        self._offer_save()
 
     def translate_phrases_from_file(self):
         """Translate phrases from file and add to Anki with audio"""
@@ -1368,14 +1786,12 @@ CRITICAL REQUIREMENTS:
             print(f"\n🔍 Debug: Raw response from Gemini...")
 
             # Remove markdown code blocks if present
-            if content.startswith("```json"):
-                content = content[7:]
-            if content.endswith("```"):
-                content = content[:-3]
-            if content.startswith("```"):
-                content = content[3:]
-            if content.endswith("```"):
-                content = content[:-3]
+            content = (
+                content.removeprefix("```json")
+                .removeprefix("```")
+                .removesuffix("```")
+                .strip()
+            )
 
             # Try to parse JSON
             try:
@@ -1387,7 +1803,7 @@ CRITICAL REQUIREMENTS:
 
             # Show preview
             print(f"\n📝 Translation preview:")
-            for i, phrase in enumerate(content_data.get("phrases", [])[:3], 1):
+            for i, phrase in enumerate(islice(content_data.get("phrases", []), 3), 1):
                 phonetic = phrase.get("phonetic", "")
                 phonetic_display = f" [{phonetic}]" if phonetic else ""
                 print(
@@ -1398,14 +1814,9 @@ CRITICAL REQUIREMENTS:
                 print(f"   ... and {len(content_data['phrases']) - 3} more phrases")
 
             # Confirm
-            confirm = (
-                input(
-                    f"\nCreate {len(content_data.get('phrases', []))} cards with audio? (y/n): "
-                )
-                .strip()
-                .lower()
-            )
-            if confirm != "y":
+            if not self.confirm(
+                f"\nCreate {len(content_data.get('phrases', []))} cards with audio? (y/n): "
+            ):
                 print("❌ Cancelled")
                 return False
 
@@ -1427,38 +1838,107 @@ CRITICAL REQUIREMENTS:
 
     def show_current_config(self):
         """Show current configuration"""
-        print("\n📋 Current Configuration")
-        print("=" * 30)
-        print(f"Deck: {self.config.get('deck_name', 'Not set')}")
-        print(f"Text field: {self.config.get('text_field', 'Not set')}")
-        print(f"Audio field: {self.config.get('audio_field', 'Not set')}")
-        print(f"Target language: {self.config.get('target_language', 'Not set')}")
-        print(f"Mother language: {self.config.get('mother_language', 'Not set')}")
-        print(
-            f"Gemini API: {'✅ Configured' if self.config.get('gemini_api_key') else '❌ Not configured'}"
-        )
-        print(
-            f"ElevenLabs API: {'✅ Configured' if self.config.get('api_key') else '❌ Not configured'}"
+        cfg = self.config.get
+        sys.stdout.write(
+            "\n📋 Current Configuration\n"
+            + "=" * 30
+            + f"""
+Deck: {cfg('deck_name', 'Not set')}
+Text field: {cfg('text_field', 'Not set')}
+Audio field: {cfg('audio_field', 'Not set')}
+Target language: {cfg('target_language', 'Not set')}
+Mother language: {cfg('mother_language', 'Not set')}
+Gemini API: {'✅ Configured' if cfg('gemini_api_key') else '❌ Not configured'}
+ElevenLabs API: {'✅ Configured' if cfg('api_key') else '❌ Not configured'}
+Voice ID: {cfg('voice_id', 'Not set')}
+
+"""
         )
-        print(f"Voice ID: {self.config.get('voice_id', 'Not set')}")
-        print()
+
+    # The menu never changes, so render it once at class definition
+    _MENU = (
+        "\n🎯 What would you like to do?\n" + "=" * 40 + "\n"
+        "1. Generate vocabulary (words & phrases)\n"
+        "2. Generate grammar rules with pronunciation tips\n"
+        "3. Add audio to existing cards\n"
+        "4. Both (generate vocabulary + add audio)\n"
+        "5. Both (generate grammar + add audio)\n"
+        "6. Translate phrases from file + add audio\n"
+        "7. Configure settings\n"
+        "8. Exit\n\n"
+    )
 
     def show_menu(self):
         """Show main menu options"""
-        print("\n🎯 What would you like to do?")
-        print("=" * 40)
-        print("1. Generate vocabulary (words & phrases)")
-        print("2. Generate grammar rules with pronunciation tips")
-        print("3. Add audio to existing cards")
-        print("4. Both (generate vocabulary + add audio)")
-        print("5. Both (generate grammar + add audio)")
-        print("6. Translate phrases from file + add audio")
-        print("7. Configure settings")
-        print("8. Exit")
-        print()
+        sys.stdout.write(self._MENU)
+
+    def _vocab_then_audio(self):
+        """Menu choice 4: generate vocabulary, then add audio to all cards"""
+        if not self.generate_and_add_content():
+            print("❌ Vocabulary generation failed")
+            return False
+        print("\n" + "=" * 50)
+        print("Now adding audio to all cards...")
+        if not self.process_deck():
+            print("⚠️ Vocabulary generated but audio processing failed")
+            return False
+        return True
+
+    def _grammar_then_audio(self):
+        """Menu choice 5: generate grammar rules, then add audio to all cards"""
+        if not self.generate_and_add_grammar_content():
+            print("❌ Grammar generation failed")
+            return False
+        print("\n" + "=" * 50)
+        print("Now adding audio to all cards...")
+        if not self.process_deck():
+            print("⚠️ Grammar generated but audio processing failed")
+            return False
+        return True
+
+    def _configure_menu(self):
+        """Settings submenu (menu choice 7)"""
+        print("\n⚙️ Configuration Menu")
+        print("=" * 30)
+        print("1. Change deck and field settings")
+        print("2. Change language settings")
+        print("3. Change API settings")
+        print("4. View current configuration")
+        print("5. Back to main menu")
+
+        config_choice = input("Enter your choice (1-5): ").strip()
+
+        handlers = {
+            "1": self.configure_deck_settings,
+            "2": self.configure_language_settings,
+            "3": self.configure_api_settings,
+            "4": self.show_current_config,
+        }
+        if config_choice == "5":
+            return
+        handler = handlers.get(config_choice)
+        if handler:
+            handler()
+        else:
+            print("❌ Invalid choice")
+
+    def _ask_continue(self):
+        """Shared 'anything else?' prompt for the menu tail"""
+        return (
+            input("\nWould you like to do something else? (y/n): ").strip().lower()
+            == "y"
+        )
+
+    def run(self, action=None, assume_yes=False):
+        """Main CLI flow
+
+        With `action` set the chosen step runs once without the menu loop,
+        enabling scripted/headless use; `assume_yes` auto-answers the
+        confirmation prompts.
+        """
+        self.interactive = action is None
+        self.assume_yes = assume_yes
 
-    def run(self):
-        """Main CLI flow"""
         self.print_banner()
 
         # Step 1: Check Anki
@@ -1477,128 +1957,98 @@ CRITICAL REQUIREMENTS:
         if not self.initialize_elevenlabs():
             return False
 
-        # Step 4: Show menu and process
+        # Step 4: Run the requested action directly, or show the menu
+        if action == "both":
+            return self.generate_and_add_content() and self.process_deck()
+        if action:
+            handlers = {
+                "content": self.generate_and_add_content,
+                "grammar": self.generate_and_add_grammar_content,
+                "audio": self.process_deck,
+                "translate": self.translate_phrases_from_file,
+            }
+            return handlers[action]()
+        # Dispatch table: choice -> (handler, success message, failure
+        # message). Compound handlers print their own partial-failure detail,
+        # so their failure slot is None.
+        menu_actions = {
+            "1": (
+                self.generate_and_add_content,
+                "Vocabulary generation completed!",
+                "Vocabulary generation failed",
+            ),
+            "2": (
+                self.generate_and_add_grammar_content,
+                "Grammar generation completed!",
+                "Grammar generation failed",
+            ),
+            "3": (self.process_deck, "Audio processing completed!", "Audio processing failed"),
+            "4": (
+                self._vocab_then_audio,
+                "Both vocabulary generation and audio processing completed!",
+                None,
+            ),
+            "5": (
+                self._grammar_then_audio,
+                "Both grammar generation and audio processing completed!",
+                None,
+            ),
+            "6": (
+                self.translate_phrases_from_file,
+                "Phrase translation and audio completed!",
+                "Phrase translation failed",
+            ),
+        }
+
         while True:
             self.show_menu()
             choice = input("Enter your choice (1-8): ").strip()
 
-            if choice == "1":
-                # Generate vocabulary content only
-                success = self.generate_and_add_content()
-                if not success:
-                    print("❌ Vocabulary generation failed")
-                else:
-                    print("✅ Vocabulary generation completed!")
-
-            elif choice == "2":
-                # Generate grammar content only
-                success = self.generate_and_add_grammar_content()
-                if not success:
-                    print("❌ Grammar generation failed")
-                else:
-                    print("✅ Grammar generation completed!")
-
-            elif choice == "3":
-                # Add audio only
-                success = self.process_deck()
-                if not success:
-                    print("❌ Audio processing failed")
-                else:
-                    print("✅ Audio processing completed!")
-
-            elif choice == "4":
-                # Both vocabulary + audio
-                success1 = self.generate_and_add_content()
-                if success1:
-                    print("\n" + "=" * 50)
-                    print("Now adding audio to all cards...")
-                    success2 = self.process_deck()
-                    if success2:
-                        print(
-                            "✅ Both vocabulary generation and audio processing completed!"
-                        )
-                    else:
-                        print("⚠️ Vocabulary generated but audio processing failed")
-                else:
-                    print("❌ Vocabulary generation failed")
-
-            elif choice == "5":
-                # Both grammar + audio
-                success1 = self.generate_and_add_grammar_content()
-                if success1:
-                    print("\n" + "=" * 50)
-                    print("Now adding audio to all cards...")
-                    success2 = self.process_deck()
-                    if success2:
-                        print(
-                            "✅ Both grammar generation and audio processing completed!"
-                        )
-                    else:
-                        print("⚠️ Grammar generated but audio processing failed")
-                else:
-                    print("❌ Grammar generation failed")
-
-            elif choice == "6":
-                # Translate phrases from file + add audio
-                success = self.translate_phrases_from_file()
-                if not success:
-                    print("❌ Phrase translation failed")
-                else:
-                    print("✅ Phrase translation and audio completed!")
-
-            elif choice == "7":
-                # Configure settings
-                print("\n⚙️ Configuration Menu")
-                print("=" * 30)
-                print("1. Change deck and field settings")
-                print("2. Change language settings")
-                print("3. Change API settings")
-                print("4. View current configuration")
-                print("5. Back to main menu")
-
-                config_choice = input("Enter your choice (1-5): ").strip()
-
-                if config_choice == "1":
-                    self.configure_deck_settings()
-                elif config_choice == "2":
-                    self.configure_language_settings()
-                elif config_choice == "3":
-                    self.configure_api_settings()
-                elif config_choice == "4":
-                    self.show_current_config()
-                elif config_choice == "5":
-                    continue
-                else:
-                    print("❌ Invalid choice")
-                    continue
-
-            elif choice == "8":
+            if choice == "8":
                 print("👋 Goodbye!")
                 return True
 
-            else:
+            if choice == "7":
+                self._configure_menu()
+                continue
+
+            entry = menu_actions.get(choice)
+            if entry is None:
                 print("❌ Invalid choice. Please enter 1-8.")
                 continue
 
-            # Ask if user wants to continue
-            if choice in ["1", "2", "3", "4", "5", "6"]:
-                continue_choice = (
-                    input("\nWould you like to do something else? (y/n): ")
-                    .strip()
-                    .lower()
-                )
-                if continue_choice != "y":
-                    print("👋 Goodbye!")
-                    return True
+            handler, success_msg, failure_msg = entry
+            if handler():
+                print(f"✅ {success_msg}")
+            elif failure_msg:
+                print(f"❌ {failure_msg}")
 
-        return True
+            # Ask if user wants to continue
+            if not self._ask_continue():
+                print("👋 Goodbye!")
+                return True
 
 
 def main():
     """Entry point"""
+    parser = argparse.ArgumentParser(
+        description="Generate German content with Gemini and add TTS audio to Anki cards"
+    )
+    parser.add_argument(
+        "--action",
+        choices=["content", "grammar", "audio", "both", "translate"],
+        help="run one action non-interactively instead of showing the menu",
+    )
+    parser.add_argument(
+        "--yes",
+        action="store_true",
+        help="assume yes for confirmation prompts (for use with --action)",
+    )
+    args = parser.parse_args()
+
     try:
         app = AnkiAudioGenerator()
-        success = app.run()
+        success = app.run(action=args.action, assume_yes=args.yes)
 
         if success:
             print("\n🎉 All done! Your Anki cards now have audio!")